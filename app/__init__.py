@@ -1,10 +1,26 @@
 """App package for video signage system."""
 
+import importlib
+
 from .core import Video, Playlist
 from .application import PlaybackService
-from .infrastructure import GoogleDriveRepository, VLCPlayer
 from .interfaces import VideoRepository, VideoPlayer, Logger
 
+# Infrastructure imports vlc at load time, so resolve its adapters on first access
+_LAZY_EXPORTS = {
+    "GoogleDriveRepository": ".infrastructure",
+    "VLCPlayer": ".infrastructure",
+}
+
+
+def __getattr__(name):
+    """Import infrastructure adapters lazily."""
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "Video",
     "Playlist",
@@ -1,14 +1,37 @@
 """Application layer with use cases for video signage system."""
 
 import logging
+import os
+import platform
 import threading
-import time
 from pathlib import Path
 from typing import List, Optional
 
 from .core import Video, Playlist
 from .interfaces import VideoPlayer, VideoRepository
 
+logger = logging.getLogger(__name__)
+
+_THREAD_PRIORITY_ABOVE_NORMAL = 1  # Win32 SetThreadPriority level
+_PLAYBACK_THREAD_NICE = -5         # Linux nice value for the playback thread
+
+
+def _raise_current_thread_priority() -> bool:
+    """Raise the calling thread one priority band above normal, if permitted."""
+    try:
+        system = platform.system()
+        if system == "Windows":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            return bool(kernel32.SetThreadPriority(kernel32.GetCurrentThread(), _THREAD_PRIORITY_ABOVE_NORMAL))
+        if system == "Linux":
+            # On Linux PRIO_PROCESS with a thread id applies to that thread only
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), _PLAYBACK_THREAD_NICE)
+            return True
+    except (OSError, AttributeError):
+        pass  # Lowering nice needs CAP_SYS_NICE; keep normal priority
+    return False
+
 
 class PlaybackService:
     """Service orchestrating video playback and synchronization."""
@@ -30,11 +53,12 @@ class PlaybackService:
         self._sync_thread = None
         self._playback_thread = None
         self._running = False
-        self.logger = logging.getLogger(__name__)
+        self._stop_event = threading.Event()
 
     def start(self) -> None:
         """Start the playback service."""
         self._running = True
+        self._stop_event.clear()
         self._initialize_cache()
         self._load_videos()
         self._start_sync_thread()
@@ -43,6 +67,7 @@ class PlaybackService:
     def stop(self) -> None:
         """Stop the playback service."""
         self._running = False
+        self._stop_event.set()
         self.video_player.stop()
 
         if self._sync_thread and self._sync_thread.is_alive():
@@ -58,81 +83,85 @@ class PlaybackService:
 
         # Cache directory for metadata and temporary files
         self.cache_dir.mkdir(exist_ok=True)
-        (self.cache_dir / "metadata").mkdir(exist_ok=True)
         (self.cache_dir / "temp").mkdir(exist_ok=True)
 
     def _load_videos(self) -> None:
         """Load videos from repository."""
         try:
             videos = self.video_repository.get_videos()
-            self.playlist = Playlist(videos)
-            self.logger.info(f"Loaded {len(videos)} videos into playlist")
+            self.playlist.update_from(videos)
+            logger.info("Loaded %s videos into playlist", len(videos))
         except Exception as e:
-            self.logger.error(f"Failed to load videos: {e}")
+            logger.error("Failed to load videos: %s", e)
 
     def _sync_videos(self) -> None:
         """Synchronize videos with remote repository."""
-        while self._running:
+        while not self._stop_event.is_set():
             try:
-                self.logger.info("Starting video synchronization")
+                logger.info("Starting video synchronization")
                 self.video_repository.sync_videos()
                 self._load_videos()  # Reload playlist after sync
-                self.logger.info("Video synchronization completed")
+                logger.info("Video synchronization completed")
             except Exception as e:
-                self.logger.error(f"Video synchronization failed: {e}")
-            finally:
-                time.sleep(self.sync_interval)
+                logger.error("Video synchronization failed: %s", e)
+
+            if self._stop_event.wait(self.sync_interval):
+                break
 
     def _playback_loop(self) -> None:
         """Main playback loop."""
-        while self._running:
+        if _raise_current_thread_priority():
+            logger.info("Playback thread priority raised")
+
+        while not self._stop_event.is_set():
             try:
                 video = self.playlist.get_next_video()
                 if video and video.is_valid():
-                    self.logger.info(f"Playing video: {video.name}")
+                    logger.info("Playing video: %s", video.name)
                     success = self.video_player.play(str(video.path))
 
                     if not success:
-                        self.logger.error(f"Failed to start video: {video.name}")
-                        time.sleep(1)
+                        logger.error("Failed to start video: %s", video.name)
+                        if self._stop_event.wait(1):
+                            return
                         continue
 
-                    # Wait for video to complete or check periodically
-                    video_start_time = time.time()
+                    # stop() may have run before play() started the video; its player stop was a no-op then
+                    if self._stop_event.is_set():
+                        self.video_player.stop()
+                        return
+
+                    # Wait for VLC to report end, error or stop
                     max_wait_time = 300  # 5 minutes max wait time as safety net
 
-                    while self._running and video.is_valid():
-                        state = self.video_player.get_state()
-
-                        # Check VLC states: 0=NothingSpecial, 1=Opening, 2=Buffering, 3=Playing, 4=Paused, 5=Stopped, 6=Ended, 7=Error
-                        if state == 6:  # Ended
-                            self.logger.info(f"Video completed: {video.name}")
-                            break
-                        elif state == 7:  # Error
-                            self.logger.error(f"Video playback error for: {video.name}")
-                            break
-                        elif state == 5:  # Stopped
-                            self.logger.info(f"Video stopped: {video.name}")
-                            break
-                        elif state in [1, 2, 3]:  # Opening, Buffering, or Playing - continue waiting
-                            if time.time() - video_start_time > max_wait_time:
-                                self.logger.warning(f"Video taking too long to complete: {video.name}")
-                                break
-                            time.sleep(1)
-                        else:
-                            # Unknown state, check periodically
-                            time.sleep(1)
+                    if not self.video_player.wait_finished(max_wait_time):
+                        logger.warning("Video taking too long to complete: %s", video.name)
+                        continue
+                    if self._stop_event.wait(0):
+                        return
+
+                    # Check VLC states: 5=Stopped, 6=Ended, 7=Error
+                    state = self.video_player.get_state()
+                    if state == 6:  # Ended
+                        logger.info("Video completed: %s", video.name)
+                    elif state == 7:  # Error
+                        logger.error("Video playback error for: %s", video.name)
+                    else:
+                        logger.info("Video stopped: %s", video.name)
 
                 elif not video:
-                    self.logger.warning("No videos available in playlist")
-                    time.sleep(5)
+                    logger.warning("No videos available in playlist")
+                    if self._stop_event.wait(5):
+                        return
                 else:
-                    self.logger.error(f"Invalid video file: {video.path}")
-                    time.sleep(1)
+                    logger.error("Invalid video file: %s", video.path)
+                    if self._stop_event.wait(1):
+                        return
 
             except Exception as e:
-                self.logger.error(f"Playback error: {e}")
-                time.sleep(1)
+                logger.error("Playback error: %s", e)
+                if self._stop_event.wait(1):
+                    return
 
     def _start_sync_thread(self) -> None:
         """Start background synchronization thread."""
@@ -142,7 +171,7 @@ class PlaybackService:
             name="VideoSync"
         )
         self._sync_thread.start()
-        self.logger.info("Video synchronization thread started")
+        logger.info("Video synchronization thread started")
 
     def _start_playback_thread(self) -> None:
         """Start video playback thread."""
@@ -152,14 +181,14 @@ class PlaybackService:
             name="VideoPlayback"
         )
         self._playback_thread.start()
-        self.logger.info("Video playback thread started")
+        logger.info("Video playback thread started")
 
     def get_status(self) -> dict:
         """Get current service status."""
         return {
             "running": self._running,
             "playlist_size": len(self.playlist.videos),
-            "current_video": getattr(self.playlist, 'current_video', None),
+            "current_video": self.playlist.current_video,
             "sync_thread_alive": self._sync_thread.is_alive() if self._sync_thread else False,
             "playback_thread_alive": self._playback_thread.is_alive() if self._playback_thread else False,
         }
\ No newline at end of file
@@ -1,12 +1,20 @@
 """Core domain entities for video signage system."""
 
-from dataclasses import dataclass
+import os
+import random
+import stat
+import sys
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Video:
     """Video entity representing a video file."""
 
@@ -20,38 +28,108 @@ class Video:
 
     def is_valid(self) -> bool:
         """Check if video file exists and is accessible."""
-        return self.path.exists() and self.path.is_file()
+        try:
+            return stat.S_ISREG(os.stat(self.path).st_mode)
+        except OSError:
+            return False
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Playlist:
     """Playlist entity managing video playback order."""
 
     videos: List[Video]
     current_index: int = 0
     shuffle: bool = False
+    _by_id: Dict[str, Video] = field(init=False, repr=False, compare=False)
+    _order: List[int] = field(init=False, repr=False, compare=False)
+    _current_video: Optional[Video] = field(default=None, init=False, repr=False, compare=False)
+    # Sync thread updates the playlist while the playback thread reads it
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
 
-    def get_next_video(self) -> Optional[Video]:
-        """Get next video in playlist."""
-        if not self.videos:
-            return None
+    def __post_init__(self) -> None:
+        """Build the video id index and playback order."""
+        self._by_id = {v.id: v for v in self.videos}
+        self._reset_order()
 
+    def _reset_order(self) -> None:
+        """Rebuild playback order, shuffled once per pass when enabled."""
+        self._order = list(range(len(self.videos)))
         if self.shuffle:
-            import random
-            return random.choice(self.videos)
+            random.shuffle(self._order)
+
+    @property
+    def current_video(self) -> Optional[Video]:
+        """Video most recently returned by get_next_video."""
+        return self._current_video
 
-        video = self.videos[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.videos)
-        return video
+    def get_next_video(self) -> Optional[Video]:
+        """Get next video in playlist."""
+        with self._lock:
+            if not self.videos:
+                self._current_video = None
+                return None
+
+            video = self.videos[self._order[self.current_index]]
+            self._current_video = video
+            self.current_index += 1
+            if self.current_index >= len(self._order):
+                self.current_index = 0
+                self._reset_order()
+            return video
 
     def add_video(self, video: Video) -> None:
         """Add video to playlist."""
-        self.videos.append(video)
+        with self._lock:
+            self._add_video(video)
 
     def remove_video(self, video_id: str) -> None:
         """Remove video from playlist."""
-        self.videos = [v for v in self.videos if v.id != video_id]
+        with self._lock:
+            self._remove_video(video_id)
+
+    def update_from(self, videos: List[Video]) -> None:
+        """Apply added, changed and removed videos in place, keeping playback position."""
+        with self._lock:
+            new_ids = {v.id for v in videos}
+            for video_id in set(self._by_id) - new_ids:
+                self._remove_video(video_id)
+
+            for video in videos:
+                existing = self._by_id.get(video.id)
+                if existing is None:
+                    self._add_video(video)
+                elif video != existing:
+                    # Same id with a new path, size or checksum: swap the entry in place
+                    self.videos[self.videos.index(existing)] = video
+                    self._by_id[video.id] = video
 
     def get_video_by_id(self, video_id: str) -> Optional[Video]:
         """Get video by ID."""
-        return next((v for v in self.videos if v.id == video_id), None)
\ No newline at end of file
+        return self._by_id.get(video_id)
+
+    def _add_video(self, video: Video) -> None:
+        """Append a video to the list, order and index; caller holds the lock."""
+        self.videos.append(video)
+        self._order.append(len(self.videos) - 1)
+        self._by_id[video.id] = video
+
+    def _remove_video(self, video_id: str) -> None:
+        """Drop a video and reindex the playback order; caller holds the lock."""
+        video = self._by_id.pop(video_id, None)
+        if video is None:
+            return
+        if video is self._current_video:
+            self._current_video = None
+
+        index = self.videos.index(video)
+        del self.videos[index]
+
+        position = self._order.index(index)
+        del self._order[position]
+        self._order = [i - 1 if i > index else i for i in self._order]
+
+        if position < self.current_index:
+            self.current_index -= 1
+        if self.current_index >= len(self._order):
+            self.current_index = 0
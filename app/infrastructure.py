@@ -3,20 +3,47 @@
 import hashlib
 import logging
 import os
+import sqlite3
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
+import functools
+import json
 import os
 import platform
 import sys
 from pathlib import Path
 
+# Resolved VLC paths persisted across process starts to skip probing
+_VLC_PATH_CACHE = Path.home() / ".cache" / "kdx-pi-signage" / "vlc_path"
+
+def _load_cached_vlc_paths():
+    """Load previously resolved VLC paths if they still exist."""
+    try:
+        with open(_VLC_PATH_CACHE) as f:
+            vlc_paths = json.load(f)
+        os.stat(vlc_paths['base_dir'])
+        vlc_paths['source'] = 'cache'
+        return vlc_paths
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _save_cached_vlc_paths(vlc_paths):
+    """Persist resolved VLC paths for the next process start."""
+    try:
+        _VLC_PATH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with open(_VLC_PATH_CACHE, 'w') as f:
+            json.dump({'base_dir': vlc_paths['base_dir'], 'plugins_dir': vlc_paths['plugins_dir']}, f)
+    except OSError:
+        pass
+
+@functools.lru_cache(maxsize=1)
 def _get_vlc_paths():
     """Get VLC installation paths based on platform and environment configuration."""
-    system = platform.system().lower()
-
     # First priority: Environment variable VLC_DIR (from pyproject.toml via uv)
     vlc_dir = os.environ.get('VLC_DIR')
 
@@ -27,7 +54,21 @@ def _get_vlc_paths():
             'source': 'environment'
         }
 
-    # Second priority: Platform-specific default paths
+    # Second priority: Path resolved by a previous start
+    vlc_paths = _load_cached_vlc_paths()
+    if vlc_paths:
+        return vlc_paths
+
+    # Third priority: Probe platform-specific default paths
+    vlc_paths = _probe_vlc_paths()
+    if vlc_paths:
+        _save_cached_vlc_paths(vlc_paths)
+    return vlc_paths
+
+def _probe_vlc_paths():
+    """Probe common VLC installation directories for the current platform."""
+    system = platform.system().lower()
+
     if system == "windows":
         # Common Windows VLC installation paths
         common_paths = [
@@ -119,34 +160,96 @@ import vlc
 from .core import Video
 from .interfaces import VideoPlayer, VideoRepository
 
+logger = logging.getLogger(__name__)
+
+# Same algorithm as Drive's md5Checksum so local and remote digests compare directly
+_CHECKSUM_ALGORITHM = "md5"
+_CHECKSUM_CHUNK_SIZE = 1 << 20  # 1 MiB reads suit SD cards and SSDs
+
 
 class GoogleDriveRepository(VideoRepository):
     """Repository for managing videos in Google Drive."""
 
-    def __init__(self, folder_id: str, credentials_path: str, videos_dir: str = "videos"):
+    def __init__(
+        self,
+        folder_id: str,
+        credentials_path: str,
+        videos_dir: str = "videos",
+        download_concurrency: int = 4
+    ):
         self.folder_id = folder_id
         self.credentials_path = credentials_path
         self.videos_dir = Path(videos_dir)  # Main Google Drive sync folder
         self.cache_dir = Path("cache")      # Metadata and temp files
-        self.logger = logging.getLogger(__name__)
+        self.download_concurrency = download_concurrency
+
+        # Single worker hashes finished downloads off the download and playback threads
+        self._hash_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="VideoHash")
+
+        # SQLite metadata index, opened on first use
+        self._metadata_db: Optional[sqlite3.Connection] = None
+        self._metadata_lock = threading.Lock()
 
-        # Initialize Google Drive client (placeholder)
+        # Google Drive client, created on first use
         self._drive_service = None
+        self._remote_files: Optional[List[dict]] = None  # Last files.list snapshot
 
     def _initialize_drive_service(self):
         """Initialize Google Drive service client."""
-        # TODO: Implement Google Drive API client initialization
-        # This would use google-api-python-client and google-auth
-        pass
+        from google.oauth2 import service_account
+        from googleapiclient.discovery import build
+
+        credentials = service_account.Credentials.from_service_account_file(
+            self.credentials_path,
+            scopes=["https://www.googleapis.com/auth/drive.readonly"]
+        )
+        self._drive_service = build("drive", "v3", credentials=credentials, cache_discovery=False)
+
+    def _list_remote_files(self) -> List[dict]:
+        """Fetch metadata of all folder videos with one paginated files.list."""
+        if self._drive_service is None:
+            self._initialize_drive_service()
+
+        files = []
+        page_token = None
+        while True:
+            response = self._drive_service.files().list(
+                q=f"'{self.folder_id}' in parents and mimeType contains 'video/' and trashed=false",
+                fields="nextPageToken, files(id,name,size,modifiedTime,md5Checksum)",
+                pageSize=1000,
+                pageToken=page_token
+            ).execute()
+            files.extend(response.get("files", []))
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                break
+
+        self._remote_files = files
+        return files
 
     def get_videos(self) -> List[Video]:
-        """Get list of videos from Google Drive."""
+        """Get list of downloaded videos from the last Google Drive snapshot."""
         try:
-            # TODO: Implement actual Google Drive API call
-            # This should return a list of video files from the specified folder
-            return []
+            remote_files = self._remote_files
+            if remote_files is None:
+                remote_files = self._list_remote_files()
+
+            videos = []
+            for file_data in remote_files:
+                video = Video(
+                    id=file_data["id"],
+                    name=file_data["name"],
+                    path=self.videos_dir / file_data["name"],
+                    size=int(file_data.get("size", 0)),
+                    modified_time=datetime.fromisoformat(file_data["modifiedTime"].replace("Z", "+00:00")),
+                    checksum=file_data.get("md5Checksum", ""),
+                    drive_id=file_data["id"]
+                )
+                if video.is_valid():
+                    videos.append(video)
+            return videos
         except Exception as e:
-            self.logger.error(f"Failed to get videos from Google Drive: {e}")
+            logger.error("Failed to get videos from Google Drive: %s", e)
             return []
 
     def download_video(self, video_id: str, local_path: Path) -> bool:
@@ -154,10 +257,10 @@ class GoogleDriveRepository(VideoRepository):
         try:
             # TODO: Implement actual download logic
             # This should download the file and return success status
-            self.logger.info(f"Downloading video {video_id} to {local_path}")
+            logger.info("Downloading video %s to %s", video_id, local_path)
             return True
         except Exception as e:
-            self.logger.error(f"Failed to download video {video_id}: {e}")
+            logger.error("Failed to download video %s: %s", video_id, e)
             return False
 
     def delete_video(self, video_id: str) -> bool:
@@ -167,143 +270,222 @@ class GoogleDriveRepository(VideoRepository):
             # For now, just remove from local cache
             return True
         except Exception as e:
-            self.logger.error(f"Failed to delete video {video_id}: {e}")
+            logger.error("Failed to delete video %s: %s", video_id, e)
             return False
 
     def sync_videos(self) -> None:
         """Synchronize local cache with Google Drive."""
         try:
-            # Get remote videos
-            remote_videos = self.get_videos()
+            # Get remote videos in a single listing
+            remote_videos = self._list_remote_files()
+            remote_ids = {rv.get("id") for rv in remote_videos}
 
             # Get local videos
-            local_videos = self._get_local_videos()
+            local_by_id = {lv.get("drive_id"): lv for lv in self._get_local_videos()}
 
             # Find videos to download
             videos_to_download = []
             for remote_video in remote_videos:
-                local_match = next(
-                    (lv for lv in local_videos if lv.drive_id == remote_video.get("id")),
-                    None
-                )
+                local_match = local_by_id.get(remote_video.get("id"))
 
                 if not local_match or self._needs_update(remote_video, local_match):
                     videos_to_download.append(remote_video)
 
             # Find videos to delete
-            videos_to_delete = []
-            for local_video in local_videos:
-                remote_match = next(
-                    (rv for rv in remote_videos if rv.get("id") == local_video.drive_id),
-                    None
-                )
-                if not remote_match:
-                    videos_to_delete.append(local_video)
+            videos_to_delete = [
+                local_video for drive_id, local_video in local_by_id.items()
+                if drive_id not in remote_ids
+            ]
 
-            # Download new/changed videos
-            for video_data in videos_to_download:
-                self._download_single_video(video_data)
+            # Download new/changed videos with bounded parallelism
+            if videos_to_download:
+                with ThreadPoolExecutor(
+                    max_workers=self.download_concurrency,
+                    thread_name_prefix="VideoDownload"
+                ) as pool:
+                    hash_futures = [
+                        future for future in pool.map(self._download_single_video, videos_to_download)
+                        if future is not None
+                    ]
+                # Metadata must be recorded before the next sync diffs against it
+                wait(hash_futures)
+                for future in hash_futures:
+                    error = future.exception()
+                    if error is not None:
+                        logger.error("Failed to finalize download: %s", error)
 
             # Delete removed videos
             for video in videos_to_delete:
                 self._delete_local_video(video)
 
         except Exception as e:
-            self.logger.error(f"Sync failed: {e}")
+            logger.error("Sync failed: %s", e)
+
+    def _get_metadata_db(self) -> sqlite3.Connection:
+        """Open the SQLite metadata index, creating it if needed."""
+        if self._metadata_db is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.cache_dir / "metadata.db"), check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                """CREATE TABLE IF NOT EXISTS videos (
+                    drive_id TEXT PRIMARY KEY,
+                    name TEXT,
+                    size INTEGER,
+                    modified_time TEXT,
+                    checksum TEXT,
+                    local_path TEXT
+                )"""
+            )
+            db.commit()
+            self._metadata_db = db
+        return self._metadata_db
 
     def _get_local_videos(self) -> List[dict]:
         """Get list of locally cached videos."""
-        local_videos = []
-        metadata_dir = self.cache_dir / "metadata"
+        try:
+            with self._metadata_lock:
+                rows = self._get_metadata_db().execute("SELECT * FROM videos").fetchall()
+            return [dict(row) for row in rows]
+        except sqlite3.Error as e:
+            logger.warning("Failed to load metadata: %s", e)
+            return []
 
-        if not metadata_dir.exists():
-            return local_videos
+    def _needs_update(self, remote_video: dict, local_video: dict) -> bool:
+        """Check if remote video needs to be downloaded."""
+        # Deleted or lost on the SD card since the last sync
+        if not os.path.exists(local_video.get("local_path") or ""):
+            return True
 
-        for metadata_file in metadata_dir.glob("*.json"):
-            try:
-                # TODO: Load metadata from JSON file
-                # This should return video metadata including drive_id, checksum, etc.
-                pass
-            except Exception as e:
-                self.logger.warning(f"Failed to load metadata {metadata_file}: {e}")
+        # A rename keeps the md5 but moves the file get_videos expects
+        if remote_video.get("name") != local_video.get("name"):
+            return True
 
-        return local_videos
+        # Drive computes md5Checksum server side, so no local hashing is needed
+        remote_md5 = remote_video.get("md5Checksum")
+        if remote_md5:
+            return remote_md5 != local_video.get("checksum")
 
-    def _needs_update(self, remote_video: dict, local_video: dict) -> bool:
-        """Check if remote video needs to be downloaded."""
-        # Compare modification times and checksums
-        return True  # Placeholder
+        # Files without md5Checksum fall back to modification time and size
+        return (
+            remote_video.get("modifiedTime") != local_video.get("modified_time")
+            or int(remote_video.get("size", 0)) != local_video.get("size")
+        )
 
-    def _download_single_video(self, video_data: dict) -> None:
-        """Download a single video file."""
+    def _download_single_video(self, video_data: dict) -> Optional[Future]:
+        """Download a single video file and queue its verification."""
         video_id = video_data.get("id")
         filename = video_data.get("name")
 
         if not video_id or not filename:
-            return
+            return None
 
         local_path = self.videos_dir / filename
 
-        # Download file
+        # Download file, then hash on the dedicated worker so this thread can take the next download
         if self.download_video(video_id, local_path):
-            # Calculate checksum
-            checksum = self._calculate_checksum(local_path)
+            return self._hash_executor.submit(self._finalize_download, video_data, local_path)
+        return None
+
+    def _finalize_download(self, video_data: dict, local_path: Path) -> None:
+        """Verify a downloaded file and record its metadata."""
+        # Calculate checksum
+        checksum = self._calculate_checksum(local_path)
+
+        # Verify download integrity against Drive's checksum
+        remote_md5 = video_data.get("md5Checksum")
+        if remote_md5 and checksum != remote_md5:
+            logger.warning("Checksum mismatch for %s, will retry next sync", video_data.get("name"))
+            return
 
-            # Save metadata
-            self._save_metadata(video_data, local_path, checksum)
+        # Save metadata
+        self._save_metadata(video_data, local_path, checksum)
 
-    def _delete_local_video(self, video: Video) -> None:
+    def _delete_local_video(self, video: dict) -> None:
         """Delete video from local cache."""
+        local_path = video["local_path"]
         try:
-            if video.path.exists():
-                video.path.unlink()
-                self.logger.info(f"Deleted local video: {video.path}")
+            with self._metadata_lock:
+                db = self._get_metadata_db()
+                db.execute("DELETE FROM videos WHERE drive_id = ?", (video["drive_id"],))
+                # A new Drive file may have been downloaded under the same name this sync
+                self._unlink_unreferenced(db, local_path)
+                db.commit()
         except Exception as e:
-            self.logger.error(f"Failed to delete local video {video.path}: {e}")
+            logger.error("Failed to delete local video %s: %s", local_path, e)
 
     def _calculate_checksum(self, file_path: Path) -> str:
-        """Calculate SHA256 checksum of file."""
+        """Calculate checksum of file using _CHECKSUM_ALGORITHM."""
         try:
-            sha256 = hashlib.sha256()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha256.update(chunk)
-            return sha256.hexdigest()
+            with open(file_path, 'rb', buffering=0) as f:
+                if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                    return hashlib.file_digest(f, _CHECKSUM_ALGORITHM).hexdigest()
+
+                # Reuse one 1 MiB buffer instead of allocating a bytes object per chunk
+                digest = hashlib.new(_CHECKSUM_ALGORITHM)
+                buffer = bytearray(_CHECKSUM_CHUNK_SIZE)
+                view = memoryview(buffer)
+                while True:
+                    size = f.readinto(buffer)
+                    if not size:
+                        break
+                    digest.update(view[:size])
+                return digest.hexdigest()
         except Exception as e:
-            self.logger.error(f"Failed to calculate checksum for {file_path}: {e}")
+            logger.error("Failed to calculate checksum for %s: %s", file_path, e)
             return ""
 
     def _save_metadata(self, video_data: dict, local_path: Path, checksum: str) -> None:
-        """Save video metadata to JSON file."""
-        metadata = {
-            "id": video_data.get("id"),
-            "name": video_data.get("name"),
-            "size": video_data.get("size", 0),
-            "modified_time": video_data.get("modifiedTime"),
-            "local_path": str(local_path),
-            "checksum": checksum,
-            "drive_id": video_data.get("id")
-        }
-
-        metadata_file = self.cache_dir / "metadata" / f"{video_data.get('id')}.json"
-
+        """Save video metadata to the SQLite index."""
+        try:
+            with self._metadata_lock:
+                db = self._get_metadata_db()
+                previous = db.execute(
+                    "SELECT local_path FROM videos WHERE drive_id = ?", (video_data.get("id"),)
+                ).fetchone()
+                db.execute(
+                    "INSERT OR REPLACE INTO videos "
+                    "(drive_id, name, size, modified_time, checksum, local_path) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        video_data.get("id"),
+                        video_data.get("name"),
+                        int(video_data.get("size", 0)),
+                        video_data.get("modifiedTime"),
+                        checksum,
+                        str(local_path),
+                    )
+                )
+                # Renamed on Drive: drop the old copy unless another video now downloads to that path
+                if previous and previous["local_path"] and previous["local_path"] != str(local_path):
+                    self._unlink_unreferenced(db, previous["local_path"])
+                db.commit()
+        except sqlite3.Error as e:
+            logger.error("Failed to save metadata for %s: %s", video_data.get('name'), e)
+
+    def _unlink_unreferenced(self, db: sqlite3.Connection, local_path: str) -> None:
+        """Delete a local file no metadata row points to; caller holds _metadata_lock."""
+        if db.execute("SELECT 1 FROM videos WHERE local_path = ?", (local_path,)).fetchone():
+            return
         try:
-            # TODO: Save metadata as JSON
-            # import json
-            # with open(metadata_file, 'w') as f:
-            #     json.dump(metadata, f, indent=2)
+            Path(local_path).unlink()
+            logger.info("Deleted local video: %s", local_path)
+        except FileNotFoundError:
             pass
-        except Exception as e:
-            self.logger.error(f"Failed to save metadata for {video_data.get('name')}: {e}")
+        except OSError as e:
+            logger.error("Failed to delete local video %s: %s", local_path, e)
 
 
 class VLCPlayer(VideoPlayer):
     """VLC-based video player for headless playback."""
 
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
+    def __init__(self, start_timeout: float = 2.0):
         self.player = None
         self.instance = None
+        self.start_timeout = start_timeout  # Max seconds to reach Playing state
+        self._started_event = threading.Event()
+        self._finished_event = threading.Event()
         self._initialize_player()
 
     def _initialize_player(self) -> None:
@@ -320,41 +502,79 @@ class VLCPlayer(VideoPlayer):
             self.instance = vlc.Instance(vlc_args)
             self.player = self.instance.media_player_new()
 
-            self.logger.info("VLC player initialized successfully")
+            event_manager = self.player.event_manager()
+            for event_type in (
+                vlc.EventType.MediaPlayerEndReached,
+                vlc.EventType.MediaPlayerEncounteredError,
+                vlc.EventType.MediaPlayerStopped,
+            ):
+                event_manager.event_attach(event_type, self._on_finished)
+            event_manager.event_attach(vlc.EventType.MediaPlayerPlaying, self._on_playing)
+
+            logger.info("VLC player initialized successfully")
 
         except Exception as e:
-            self.logger.error(f"Failed to initialize VLC player: {e}")
+            logger.error("Failed to initialize VLC player: %s", e)
             raise
 
     def play(self, video_path: str) -> bool:
         """Play video file."""
         try:
             if not os.path.exists(video_path):
-                self.logger.error(f"Video file not found: {video_path}")
+                logger.error("Video file not found: %s", video_path)
                 return False
 
             media = self.instance.media_new(video_path)
             self.player.set_media(media)
+            self._started_event.clear()
+            self._finished_event.clear()
 
             if self.player.play() == -1:
-                self.logger.error(f"Failed to play video: {video_path}")
+                logger.error("Failed to play video: %s", video_path)
+                return False
+
+            # Block until VLC reports Playing (or an early end/error) instead of returning mid-buffering
+            if not self._started_event.wait(self.start_timeout):
+                logger.error("Timed out starting video: %s", video_path)
+                self.player.stop()
                 return False
 
-            self.logger.info(f"Started playing: {video_path}")
+            if self.player.get_state() == 7:  # Error
+                logger.error("Failed to play video: %s", video_path)
+                return False
+
+            logger.info("Started playing: %s", video_path)
             return True
 
         except Exception as e:
-            self.logger.error(f"Error playing video {video_path}: {e}")
+            logger.error("Error playing video %s: %s", video_path, e)
             return False
 
+    def wait_finished(self, timeout: Optional[float] = None) -> bool:
+        """Block until playback ends, errors or stops; False on timeout."""
+        return self._finished_event.wait(timeout)
+
+    def _on_playing(self, event) -> None:
+        """Handle VLC playing event."""
+        self._started_event.set()
+
+    def _on_finished(self, event) -> None:
+        """Handle VLC end, error and stop events."""
+        self._started_event.set()
+        self._finished_event.set()
+
     def stop(self) -> None:
-        """Stop video playback."""
+        """Stop video playback; safe to call again after play()."""
         try:
             if self.player:
                 self.player.stop()
-                self.logger.info("Video playback stopped")
+                logger.info("Video playback stopped")
         except Exception as e:
-            self.logger.error(f"Error stopping playback: {e}")
+            logger.error("Error stopping playback: %s", e)
+        finally:
+            # Release waiters even if VLC's Stopped event fired before play() cleared the events
+            self._started_event.set()
+            self._finished_event.set()
 
     def is_playing(self) -> bool:
         """Check if video is currently playing."""
@@ -366,7 +586,7 @@ class VLCPlayer(VideoPlayer):
                 return state in [1, 2, 3]  # Opening, Buffering, or Playing
             return False
         except Exception as e:
-            self.logger.error(f"Error checking playback state: {e}")
+            logger.error("Error checking playback state: %s", e)
             return False
 
     def get_state(self) -> int:
@@ -376,7 +596,7 @@ class VLCPlayer(VideoPlayer):
                 return self.player.get_state()
             return 0  # NothingSpecial
         except Exception as e:
-            self.logger.error(f"Error getting player state: {e}")
+            logger.error("Error getting player state: %s", e)
             return 0
 
     def get_position(self) -> float:
@@ -385,7 +605,7 @@ class VLCPlayer(VideoPlayer):
             if self.player:
                 return self.player.get_position()
         except Exception as e:
-            self.logger.error(f"Error getting position: {e}")
+            logger.error("Error getting position: %s", e)
         return 0.0
 
     def set_position(self, position: float) -> None:
@@ -394,4 +614,4 @@ class VLCPlayer(VideoPlayer):
             if self.player:
                 self.player.set_position(max(0.0, min(1.0, position)))
         except Exception as e:
-            self.logger.error(f"Error setting position: {e}")
\ No newline at end of file
+            logger.error("Error setting position: %s", e)
\ No newline at end of file
@@ -41,7 +41,7 @@ class VideoPlayer(ABC):
 
     @abstractmethod
     def stop(self) -> None:
-        """Stop video playback."""
+        """Stop video playback; must be safe to call again after play()."""
         pass
 
     @abstractmethod
@@ -49,6 +49,11 @@ class VideoPlayer(ABC):
         """Check if video is playing."""
         pass
 
+    @abstractmethod
+    def wait_finished(self, timeout: Optional[float] = None) -> bool:
+        """Wait until current video finishes; False on timeout."""
+        pass
+
     @abstractmethod
     def get_position(self) -> float:
         """Get playback position (0.0 to 1.0)."""
@@ -1,19 +1,68 @@
 """Main entry point for video signage system."""
 
+import functools
+import hashlib
 import logging
 import os
 import platform
 import signal
 import sys
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timezone
+from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
 from typing import List, Optional
 
 from app.application import PlaybackService
-from app.infrastructure import GoogleDriveRepository, VLCPlayer
 from app.core import Video
 
+# Set by signal handlers to release the main thread for shutdown
+_shutdown = threading.Event()
+
+# Supported video extensions
+_VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.webm'})
+
+
+class DailyLogFileHandler(TimedRotatingFileHandler):
+    """File handler writing to logs/YYYY/MM/DD.log and switching files at midnight."""
+
+    def __init__(self, logs_dir: Path):
+        self.logs_dir = logs_dir
+        super().__init__(self._today_log_file(), when="midnight")
+
+    def _today_log_file(self) -> Path:
+        """Return today's log file, creating its year/month folders."""
+        log_file = self.logs_dir / datetime.now().strftime("%Y/%m/%d.log")
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        return log_file
+
+    def doRollover(self) -> None:
+        """Start appending to the new day's file instead of renaming the old one."""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.baseFilename = os.path.abspath(self._today_log_file())
+        self.stream = self._open()
+        self.rolloverAt = self.computeRollover(int(time.time()))
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter reusing the rendered asctime for records within the same second."""
+
+    def __init__(self, fmt: str, datefmt: str):
+        super().__init__(fmt, datefmt)
+        self._cached_time = (None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, cached_text = self._cached_time
+        if second == cached_second:
+            return cached_text
+        text = super().formatTime(record, datefmt)
+        self._cached_time = (second, text)  # Single assignment keeps the pair consistent across threads
+        return text
+
 
 class Application:
     """Main application class handling startup and shutdown."""
@@ -25,18 +74,12 @@ class Application:
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration."""
         logger = logging.getLogger("kdx_pi_signage")
+        if logger.handlers:
+            return logger  # Already configured; addHandler is not idempotent
         logger.setLevel(logging.INFO)
 
-        # Create logs directory structure
-        logs_dir = Path("logs")
-        today = Path(datetime.now().strftime("%Y/%m/%d.log"))
-        log_file = logs_dir / today
-
-        # Create directories if they don't exist
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-
-        # File handler
-        file_handler = logging.FileHandler(log_file)
+        # File handler, one file per day in logs/YYYY/MM/DD.log
+        file_handler = DailyLogFileHandler(Path("logs"))
         file_handler.setLevel(logging.INFO)
 
         # Console handler
@@ -44,7 +87,8 @@ class Application:
         console_handler.setLevel(logging.INFO)
 
         # Formatter
-        formatter = logging.Formatter(
+        # Shared by both handlers so each second is rendered once
+        formatter = CachedTimeFormatter(
             "[%(asctime)s] %(levelname)s: %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
@@ -61,46 +105,57 @@ class Application:
         videos = []
         test_videos_path = Path(test_videos_dir)
 
-        self.logger.info(f"Current working directory: {Path.cwd().absolute()}")
-        self.logger.info(f"Looking for videos in: {test_videos_path.absolute()}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Current working directory: %s", Path.cwd().absolute())
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Looking for videos in: %s", test_videos_path.absolute())
 
-        if not test_videos_path.exists():
-            self.logger.warning(f"Test videos directory {test_videos_dir} does not exist")
+        # Let scandir report a missing directory instead of probing it first
+        try:
+            with os.scandir(test_videos_path) as it:
+                entries = list(it)
+        except FileNotFoundError:
+            self.logger.warning("Test videos directory %s does not exist", test_videos_dir)
             return videos
+        self.logger.debug("Found %s files/directories in %s", len(entries), test_videos_dir)
 
-        # Supported video extensions
-        video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.webm'}
+        for entry in entries:
+            suffix = os.path.splitext(entry.name)[1].lower()
+            is_file = entry.is_file()
+            self.logger.debug("Processing file: %s (is_file: %s, suffix: '%s')", entry.name, is_file, suffix)
 
-        # Debug: List all files in directory
-        all_files = list(test_videos_path.iterdir())
-        self.logger.info(f"Found {len(all_files)} files/directories in {test_videos_dir}")
+            if is_file and suffix in _VIDEO_EXTENSIONS:
+                try:
+                    stat = entry.stat()
 
-        for video_file in all_files:
-            self.logger.info(f"Processing file: {video_file.name} (is_file: {video_file.is_file()}, suffix: '{video_file.suffix.lower()}')")
+                    # Stable across runs, and changes when the file is replaced
+                    digest = hashlib.blake2b(digest_size=12)
+                    digest.update(entry.name.encode("utf-8"))
+                    digest.update(stat.st_size.to_bytes(8, "little"))
+                    digest.update(int(stat.st_mtime).to_bytes(8, "little", signed=True))
 
-            if video_file.is_file() and video_file.suffix.lower() in video_extensions:
-                try:
-                    stat = video_file.stat()
                     video = Video(
-                        id=f"local_{video_file.stem}",
-                        name=video_file.name,
-                        path=video_file,
+                        id=f"local_{os.path.splitext(entry.name)[0]}",
+                        name=entry.name,
+                        path=Path(entry.path),
                         size=stat.st_size,
-                        modified_time=datetime.fromtimestamp(stat.st_mtime),
-                        checksum=f"local_{hash(str(video_file.name))}"  # Simple checksum for local files
+                        modified_time=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+                        checksum="local_" + digest.hexdigest()
                     )
                     videos.append(video)
-                    self.logger.info(f"Added video: {video_file.name}")
+                    self.logger.debug("Added video: %s", entry.name)
                 except Exception as e:
-                    self.logger.warning(f"Error processing local video {video_file}: {e}")
+                    self.logger.warning("Error processing local video %s: %s", entry.path, e)
             else:
-                self.logger.info(f"Skipped file: {video_file.name} (not a video file)")
+                self.logger.debug("Skipped file: %s (not a video file)", entry.name)
 
-        self.logger.info(f"Found {len(videos)} local videos in {test_videos_dir}")
+        self.logger.info("Found %s local videos in %s", len(videos), test_videos_dir)
         return videos
 
-    def _load_configuration(self) -> dict:
-        """Load configuration from environment variables provided by uv."""
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _load_configuration() -> dict:
+        """Load configuration from environment variables provided by uv, once per process."""
         return {
             "google_drive_folder_id": os.getenv("GOOGLE_DRIVE_FOLDER_ID", ""),
             "google_credentials_path": os.getenv("GOOGLE_APPLICATION_CREDENTIALS", ""),
@@ -115,16 +170,23 @@ class Application:
 
     def _create_dependencies(self, config: dict):
         """Create and wire dependencies using dependency injection."""
-        vlc_player = VLCPlayer()
-
-        # Choose video repository based on sync configuration
+        # Validate sync configuration before libvlc initializes, so its errors cannot mask these
         if config["google_drive_sync_enabled"]:
-            # Use Google Drive repository for sync
             if not config["google_drive_folder_id"]:
                 raise ValueError("GOOGLE_DRIVE_FOLDER_ID environment variable is required when GOOGLE_DRIVE_SYNC_ENABLED=true")
             if not config["google_credentials_path"]:
                 raise ValueError("GOOGLE_APPLICATION_CREDENTIALS environment variable is required when GOOGLE_DRIVE_SYNC_ENABLED=true")
 
+        # Imported here so vlc and Google clients load only when actually wired
+        from app.infrastructure import VLCPlayer
+
+        vlc_player = VLCPlayer()
+
+        # Choose video repository based on sync configuration
+        if config["google_drive_sync_enabled"]:
+            # Use Google Drive repository for sync
+            from app.infrastructure import GoogleDriveRepository
+
             video_repository = GoogleDriveRepository(
                 folder_id=config["google_drive_folder_id"],
                 credentials_path=config["google_credentials_path"],
@@ -170,14 +232,7 @@ class Application:
             # Load configuration
             config = self._load_configuration()
 
-            # Validate required configuration based on sync mode
-            if config["google_drive_sync_enabled"]:
-                if not config["google_drive_folder_id"]:
-                    raise ValueError("GOOGLE_DRIVE_FOLDER_ID environment variable is required when GOOGLE_DRIVE_SYNC_ENABLED=true")
-                if not config["google_credentials_path"]:
-                    raise ValueError("GOOGLE_APPLICATION_CREDENTIALS environment variable is required when GOOGLE_DRIVE_SYNC_ENABLED=true")
-
-            # Create dependencies
+            # Create dependencies (validates sync configuration)
             self._create_dependencies(config)
 
             # Start playback service
@@ -206,8 +261,7 @@ class Application:
     def handle_signal(self, signum, frame):
         """Handle system signals for graceful shutdown."""
         self.logger.info(f"Received signal {signum}, shutting down gracefully...")
-        self.stop()
-        sys.exit(0)
+        _shutdown.set()
 
 
 def main():
@@ -217,20 +271,21 @@ def main():
     # Register signal handlers for graceful shutdown
     signal.signal(signal.SIGTERM, app.handle_signal)
     signal.signal(signal.SIGINT, app.handle_signal)
+    if hasattr(signal, "SIGBREAK"):
+        # Windows Ctrl+Break
+        signal.signal(signal.SIGBREAK, app.handle_signal)
 
     try:
         # Start the application
         app.start()
 
-        # Keep main thread alive (cross-platform)
-        while True:
-            if platform.system() == "Windows":
-                # On Windows, signal.pause() doesn't exist, so we use a simple sleep loop
-                # The signal handlers will still work to break out of this loop
-                time.sleep(1)
-            else:
-                # On Unix-like systems, use signal.pause()
-                signal.pause()
+        # Block main thread until a signal requests shutdown
+        if platform.system() == "Windows":
+            # Untimed lock waits are not interruptible by Ctrl+C on Windows
+            while not _shutdown.wait(1):
+                pass
+        else:
+            _shutdown.wait()
 
     except KeyboardInterrupt:
         print("\nReceived keyboard interrupt, shutting down...")
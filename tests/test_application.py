@@ -0,0 +1,55 @@
+"""Tests for the playback service."""
+
+import threading
+from datetime import datetime, timezone
+
+from app.application import PlaybackService
+from app.core import Video
+
+
+class RacingPlayer:
+    """Player whose video starts just after the service was asked to stop."""
+
+    def __init__(self):
+        self.service = None
+        self.calls = []
+        self._finished = threading.Event()
+
+    def play(self, video_path: str) -> bool:
+        self.calls.append("play")
+        self.service._stop_event.set()  # stop() lands while play() is starting the video
+        return True
+
+    def stop(self) -> None:
+        self.calls.append("stop")
+        self._finished.set()
+
+    def wait_finished(self, timeout=None) -> bool:
+        return self._finished.wait(timeout)
+
+    def get_state(self) -> int:
+        return 5  # Stopped
+
+
+def test_playback_loop_stops_video_started_during_shutdown(tmp_path):
+    video_path = tmp_path / "a.mp4"
+    video_path.write_bytes(b"video")
+    video = Video(
+        id="a",
+        name="a.mp4",
+        path=video_path,
+        size=5,
+        modified_time=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        checksum="abc",
+    )
+    player = RacingPlayer()
+    service = PlaybackService(video_repository=None, video_player=player)
+    player.service = service
+    service.playlist.update_from([video])
+
+    thread = threading.Thread(target=service._playback_loop, daemon=True)
+    thread.start()
+    thread.join(timeout=2)
+
+    assert not thread.is_alive()
+    assert player.calls == ["play", "stop"]
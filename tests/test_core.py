@@ -0,0 +1,122 @@
+"""Tests for core domain entities."""
+
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core import Playlist, Video
+
+
+def make_video(video_id: str, checksum: str = "abc") -> Video:
+    """Build a video pointing at a non-existent file."""
+    return Video(
+        id=video_id,
+        name=f"{video_id}.mp4",
+        path=Path(f"{video_id}.mp4"),
+        size=1,
+        modified_time=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        checksum=checksum,
+    )
+
+
+def next_ids(playlist: Playlist, count: int) -> list:
+    """Return ids of the next count videos."""
+    return [playlist.get_next_video().id for _ in range(count)]
+
+
+def test_empty_playlist_returns_none():
+    playlist = Playlist([])
+    assert playlist.get_next_video() is None
+    assert playlist.current_video is None
+
+
+def test_plays_in_order_and_wraps():
+    playlist = Playlist([make_video("a"), make_video("b"), make_video("c")])
+    assert next_ids(playlist, 4) == ["a", "b", "c", "a"]
+    assert playlist.current_video.id == "a"
+
+
+def test_shuffle_plays_each_video_once_per_pass():
+    playlist = Playlist([make_video(str(i)) for i in range(10)], shuffle=True)
+    assert sorted(next_ids(playlist, 10)) == sorted(str(i) for i in range(10))
+    assert sorted(next_ids(playlist, 10)) == sorted(str(i) for i in range(10))
+
+
+def test_add_video_plays_later_in_current_pass():
+    playlist = Playlist([make_video("a"), make_video("b")])
+    assert next_ids(playlist, 1) == ["a"]
+    playlist.add_video(make_video("c"))
+    assert next_ids(playlist, 3) == ["b", "c", "a"]
+
+
+def test_remove_already_played_video_keeps_position():
+    playlist = Playlist([make_video("a"), make_video("b"), make_video("c")])
+    assert next_ids(playlist, 2) == ["a", "b"]
+    playlist.remove_video("a")
+    assert next_ids(playlist, 3) == ["c", "b", "c"]
+
+
+def test_remove_upcoming_video_skips_it():
+    playlist = Playlist([make_video("a"), make_video("b"), make_video("c")])
+    assert next_ids(playlist, 1) == ["a"]
+    playlist.remove_video("b")
+    assert next_ids(playlist, 2) == ["c", "a"]
+
+
+def test_remove_last_video_in_pass_wraps():
+    playlist = Playlist([make_video("a"), make_video("b"), make_video("c")])
+    assert next_ids(playlist, 2) == ["a", "b"]
+    playlist.remove_video("c")
+    assert next_ids(playlist, 2) == ["a", "b"]
+
+
+def test_remove_current_video_clears_current():
+    playlist = Playlist([make_video("a"), make_video("b")])
+    next_ids(playlist, 1)
+    playlist.remove_video("a")
+    assert playlist.current_video is None
+    assert playlist.get_video_by_id("a") is None
+
+
+def test_update_from_adds_and_removes_keeping_position():
+    playlist = Playlist([make_video("a"), make_video("b"), make_video("c")])
+    assert next_ids(playlist, 1) == ["a"]
+    playlist.update_from([make_video("a"), make_video("c"), make_video("d")])
+    assert next_ids(playlist, 3) == ["c", "d", "a"]
+
+
+def test_update_from_replaces_changed_video():
+    playlist = Playlist([make_video("a"), make_video("b")])
+    changed = make_video("b", checksum="def")
+    playlist.update_from([make_video("a"), changed])
+    assert playlist.get_video_by_id("b") is changed
+    assert next_ids(playlist, 2) == ["a", "b"]
+    assert playlist.current_video is changed
+
+
+def test_concurrent_update_keeps_playlist_consistent():
+    full = [make_video(str(i)) for i in range(50)]
+    half = full[::2]
+    playlist = Playlist(list(full), shuffle=True)
+    stop = threading.Event()
+    errors = []
+
+    def play():
+        try:
+            while not stop.is_set():
+                playlist.get_next_video()
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=play)
+    reader.start()
+    try:
+        for i in range(200):
+            playlist.update_from(half if i % 2 else full)
+    finally:
+        stop.set()
+        reader.join()
+
+    assert not errors
+    assert sorted(playlist._order) == list(range(len(playlist.videos)))
+    assert set(playlist._by_id) == {v.id for v in playlist.videos}
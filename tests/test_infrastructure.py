@@ -0,0 +1,210 @@
+"""Tests for the Google Drive download, hash and metadata pipeline."""
+
+import hashlib
+import sys
+import types
+
+import pytest
+
+# The VLC adapter is not exercised here; a bare module satisfies the import
+sys.modules.setdefault("vlc", types.ModuleType("vlc"))
+
+from app.infrastructure import GoogleDriveRepository  # noqa: E402
+
+
+def remote_file(file_id: str, name: str, content: bytes) -> dict:
+    """Build a files.list entry as returned by Google Drive."""
+    return {
+        "id": file_id,
+        "name": name,
+        "size": str(len(content)),
+        "modifiedTime": "2024-01-01T12:00:00Z",
+        "md5Checksum": hashlib.md5(content).hexdigest(),
+    }
+
+
+class FakeDrive:
+    """In-memory Drive folder serving listings and downloads."""
+
+    def __init__(self):
+        self.files = []
+        self.contents = {}
+        self.downloads = []
+
+    def put(self, file_id: str, name: str, content: bytes) -> None:
+        self.files = [f for f in self.files if f["id"] != file_id]
+        self.files.append(remote_file(file_id, name, content))
+        self.contents[file_id] = content
+
+    def remove(self, file_id: str) -> None:
+        self.files = [f for f in self.files if f["id"] != file_id]
+        del self.contents[file_id]
+
+    def list_files(self) -> list:
+        return list(self.files)
+
+    def download(self, video_id, local_path) -> bool:
+        self.downloads.append(video_id)
+        local_path.write_bytes(self.contents[video_id])
+        return True
+
+
+@pytest.fixture
+def drive():
+    return FakeDrive()
+
+
+@pytest.fixture
+def repo(tmp_path, drive):
+    repository = GoogleDriveRepository(
+        folder_id="folder",
+        credentials_path="credentials.json",
+        videos_dir=str(tmp_path / "videos"),
+        download_concurrency=1
+    )
+    repository.cache_dir = tmp_path / "cache"
+    repository.videos_dir.mkdir()
+    repository._list_remote_files = drive.list_files
+    repository.download_video = drive.download
+    yield repository
+    repository._hash_executor.shutdown()
+    if repository._metadata_db is not None:
+        repository._metadata_db.close()
+
+
+def rows_by_id(repo: GoogleDriveRepository) -> dict:
+    return {row["drive_id"]: row for row in repo._get_local_videos()}
+
+
+def local_names(repo: GoogleDriveRepository) -> set:
+    return {path.name for path in repo.videos_dir.iterdir()}
+
+
+def test_initial_sync_downloads_and_records_metadata(repo, drive):
+    drive.put("A", "a.mp4", b"alpha")
+    repo.sync_videos()
+
+    row = rows_by_id(repo)["A"]
+    assert drive.downloads == ["A"]
+    assert row["name"] == "a.mp4"
+    assert row["size"] == 5
+    assert row["checksum"] == hashlib.md5(b"alpha").hexdigest()
+    assert row["local_path"] == str(repo.videos_dir / "a.mp4")
+    assert [v.id for v in repo.get_videos()] == ["A"]
+
+
+def test_unchanged_resync_downloads_nothing(repo, drive):
+    drive.put("A", "a.mp4", b"alpha")
+    drive.put("B", "b.mp4", b"beta")
+    repo.sync_videos()
+
+    drive.downloads.clear()
+    repo.sync_videos()
+
+    assert drive.downloads == []
+    assert local_names(repo) == {"a.mp4", "b.mp4"}
+
+
+def test_changed_content_is_downloaded_again(repo, drive):
+    drive.put("A", "a.mp4", b"alpha")
+    repo.sync_videos()
+
+    drive.put("A", "a.mp4", b"alpha v2")
+    drive.downloads.clear()
+    repo.sync_videos()
+
+    assert drive.downloads == ["A"]
+    assert rows_by_id(repo)["A"]["checksum"] == hashlib.md5(b"alpha v2").hexdigest()
+
+
+def test_md5_mismatch_saves_no_row_and_retries(repo, drive):
+    drive.put("A", "a.mp4", b"alpha")
+    drive.contents["A"] = b"corrupted"
+    repo.sync_videos()
+
+    assert rows_by_id(repo) == {}
+
+    drive.contents["A"] = b"alpha"
+    drive.downloads.clear()
+    repo.sync_videos()
+
+    assert drive.downloads == ["A"]
+    assert "A" in rows_by_id(repo)
+
+
+def test_deleted_on_drive_removes_row_and_file(repo, drive):
+    drive.put("A", "a.mp4", b"alpha")
+    drive.put("B", "b.mp4", b"beta")
+    repo.sync_videos()
+
+    drive.remove("A")
+    repo.sync_videos()
+
+    assert set(rows_by_id(repo)) == {"B"}
+    assert local_names(repo) == {"b.mp4"}
+    assert [v.id for v in repo.get_videos()] == ["B"]
+
+
+def test_finalize_errors_are_logged(repo, drive, caplog):
+    drive.put("A", "a.mp4", b"alpha")
+    drive.files[0]["size"] = "not a number"
+    repo.sync_videos()
+
+    assert rows_by_id(repo) == {}
+    assert "Failed to finalize download" in caplog.text
+
+
+def test_rename_downloads_new_name_and_deletes_old_file(repo, drive):
+    drive.put("A", "a.mp4", b"alpha")
+    repo.sync_videos()
+
+    drive.put("A", "b.mp4", b"alpha")
+    drive.downloads.clear()
+    repo.sync_videos()
+
+    assert drive.downloads == ["A"]
+    assert local_names(repo) == {"b.mp4"}
+    assert rows_by_id(repo)["A"]["local_path"] == str(repo.videos_dir / "b.mp4")
+    assert [v.name for v in repo.get_videos()] == ["b.mp4"]
+
+
+def test_rename_keeps_old_path_reused_by_new_file(repo, drive):
+    drive.put("A", "a.mp4", b"alpha")
+    repo.sync_videos()
+
+    # C takes A's old name in the same sync and is hashed before A
+    drive.files = []
+    drive.put("C", "a.mp4", b"gamma")
+    drive.put("A", "b.mp4", b"alpha")
+    repo.sync_videos()
+
+    assert local_names(repo) == {"a.mp4", "b.mp4"}
+    assert (repo.videos_dir / "a.mp4").read_bytes() == b"gamma"
+    assert sorted(v.id for v in repo.get_videos()) == ["A", "C"]
+
+
+def test_delete_keeps_path_reused_by_new_file(repo, drive):
+    drive.put("A", "a.mp4", b"alpha")
+    repo.sync_videos()
+
+    # A is deleted on Drive and C is uploaded under the same name
+    drive.remove("A")
+    drive.put("C", "a.mp4", b"gamma")
+    repo.sync_videos()
+
+    assert set(rows_by_id(repo)) == {"C"}
+    assert (repo.videos_dir / "a.mp4").read_bytes() == b"gamma"
+    assert [v.id for v in repo.get_videos()] == ["C"]
+
+
+def test_missing_local_file_is_downloaded_again(repo, drive):
+    drive.put("A", "a.mp4", b"alpha")
+    repo.sync_videos()
+
+    (repo.videos_dir / "a.mp4").unlink()
+    drive.downloads.clear()
+    repo.sync_videos()
+
+    assert drive.downloads == ["A"]
+    assert (repo.videos_dir / "a.mp4").read_bytes() == b"alpha"
+    assert [v.id for v in repo.get_videos()] == ["A"]